@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import io
 import math
 import os
@@ -147,48 +148,69 @@ def parse_background(value: Optional[str]) -> Optional[Tuple[int, int, int, int]
     return (r, g, b, 255)
 
 
+GRADIENT_RE = re.compile(
+    r'(<linearGradient\b(?P<attrs>[^>]*)>)(?P<body>.*?</linearGradient>)',
+    flags=re.IGNORECASE | re.DOTALL,
+)
+# Attribute and CSS forms as alternates of one pattern, so finding the first
+# stop color is a single scan of the gradient body.
+STOP_COLOR_RE = re.compile(r'stop-color="([^"]+)"|stop-color\s*:\s*([^;"\']+)', flags=re.IGNORECASE)
+GRADIENT_ID_RE = re.compile(r'id="([^"]+)"', flags=re.IGNORECASE)
+NAN_TOKEN_RE = re.compile(r'[-+]?nan', flags=re.IGNORECASE)
+
+
 def sanitize_svg_text(text: str) -> str:
     broken_gradient_ids = {}
 
-    gradient_re = re.compile(
-        r'(<linearGradient\b(?P<attrs>[^>]*)>)(?P<body>.*?</linearGradient>)',
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-
     def first_stop_color(body: str) -> str:
-        m = re.search(r'stop-color="([^"]+)"', body, flags=re.IGNORECASE)
-        if m:
-            return m.group(1)
-        m = re.search(r'stop-color\s*:\s*([^;"\']+)', body, flags=re.IGNORECASE)
+        m = STOP_COLOR_RE.search(body)
         if m:
-            return m.group(1).strip()
+            attr_value = m.group(1)
+            if attr_value is not None:
+                return attr_value
+            return m.group(2).strip()
         return "#FFFFFF"
 
-    for match in gradient_re.finditer(text):
+    for match in GRADIENT_RE.finditer(text):
         attrs = match.group("attrs")
         if "nan" not in attrs.lower():
             continue
-        id_match = re.search(r'id="([^"]+)"', attrs, flags=re.IGNORECASE)
+        id_match = GRADIENT_ID_RE.search(attrs)
         if not id_match:
             continue
         broken_gradient_ids[id_match.group(1)] = first_stop_color(match.group("body"))
 
-    for gradient_id, color in broken_gradient_ids.items():
-        text = re.sub(rf'url\(\s*#{re.escape(gradient_id)}\s*\)', color, text)
+    if not broken_gradient_ids:
+        # Last-resort cleanup for any remaining NaN tokens in numeric attributes.
+        return NAN_TOKEN_RE.sub("0", text)
 
-    # Last-resort cleanup for any remaining NaN tokens in numeric attributes.
-    text = re.sub(r'(?i)([-+]?nan)', "0", text)
-    return text
+    # Single combined pass: references to broken gradients become their first
+    # stop color and leftover NaN tokens become 0, without a second full scan
+    # of the document for the cleanup.
+    alternation = "|".join(re.escape(gradient_id) for gradient_id in broken_gradient_ids)
+    combined_re = re.compile(rf'url\(\s*#({alternation})\s*\)|(?i:[-+]?nan)')
+
+    def replace(m: "re.Match[str]") -> str:
+        gradient_id = m.group(1)
+        if gradient_id is not None:
+            return broken_gradient_ids[gradient_id]
+        return "0"
+
+    return combined_re.sub(replace, text)
 
 
 def read_svg_bytes(svg_path: Path, sanitize: bool = True) -> bytes:
-    text = svg_path.read_text(encoding="utf-8")
-    if sanitize:
-        cleaned = sanitize_svg_text(text)
-        if cleaned != text:
-            print(f"[warn] sanitized invalid numeric SVG data in {svg_path.name}", file=sys.stderr)
-        text = cleaned
-    return text.encode("utf-8")
+    data = svg_path.read_bytes()
+    # Sanitizing only matters when some NaN token survives in the document,
+    # and bytes membership is a fast memmem scan, so clean sources (the
+    # common case) skip the UTF-8 decode and all regex work.
+    if not sanitize or b"nan" not in data.lower():
+        return data
+    text = data.decode("utf-8")
+    cleaned = sanitize_svg_text(text)
+    if cleaned != text:
+        print(f"[warn] sanitized invalid numeric SVG data in {svg_path.name}", file=sys.stderr)
+    return cleaned.encode("utf-8")
 
 
 def qimage_to_pillow_rgba(image: "QImage") -> Image.Image:
@@ -504,13 +526,79 @@ def write_uoic(path: Path, frames: list[Tuple[int, Image.Image]], alpha_mode: st
     path.write_bytes(header + entries + blobs)
 
 
+def rasterize_icon(
+    svg_path: Path,
+    output_root: Path,
+    sizes: list[int],
+    supersample: int,
+    renderer: str,
+    sanitize: bool,
+    filter_name: str,
+    color_space: str,
+    alpha_mode: str,
+    background: Optional[Tuple[int, int, int, int]],
+    emit_png_preview: bool,
+) -> None:
+    filt = resampling_filter(filter_name)
+    frames: list[Tuple[int, Image.Image]] = []
+    for size in sizes:
+        high_res = render_svg(
+            svg_path,
+            size=size,
+            supersample=supersample,
+            renderer=renderer,
+            sanitize=sanitize,
+        )
+        frame_alpha = "straight" if background is not None or alpha_mode == "opaque" else alpha_mode
+        image = downsample_rgba(
+            high_res,
+            target_size=size,
+            filt=filt,
+            color_space=color_space,
+            alpha_mode=frame_alpha,
+        )
+        image = flatten_if_requested(image, background)
+        if alpha_mode == "opaque":
+            image = image.convert("RGB").convert("RGBA")
+            # Force alpha fully opaque after flatten.
+            if np is not None:
+                arr = np.asarray(image, dtype=np.uint8).copy()
+                arr[:, :, 3] = 255
+                image = Image.fromarray(arr, "RGBA")
+            else:
+                r, g, b, _a = image.split()
+                image = Image.merge("RGBA", (r, g, b, Image.new("L", image.size, 255)))
+
+        frames.append((size, image))
+
+        if emit_png_preview:
+            size_dir = output_root / str(size)
+            size_dir.mkdir(parents=True, exist_ok=True)
+
+            preview_path = size_dir / f"{svg_path.stem}.png"
+            # PNGs should be straight-alpha for accurate inspection in normal viewers.
+            if alpha_mode == "premultiplied" and background is None:
+                # Re-render as straight preview rather than trying to unpremultiply quantized frame pixels.
+                preview_image = downsample_rgba(
+                    high_res,
+                    target_size=size,
+                    filt=filt,
+                    color_space=color_space,
+                    alpha_mode="straight",
+                )
+                preview_image.save(preview_path)
+            else:
+                image.save(preview_path)
+
+    write_uoic(output_root / f"{svg_path.stem}.uoic", frames, alpha_mode)
+
+
 def main() -> int:
     args = parse_args()
     source_root = Path(args.source_root)
     output_root = Path(args.output_root)
     sizes = sorted({size for size in args.sizes if size > 0})
     background = parse_background(args.background)
-    filt = resampling_filter(args.filter)
 
     if not source_root.is_dir():
         raise SystemExit(f"App icon source root not found: {source_root}")
@@ -524,59 +612,32 @@ def main() -> int:
     shutil.rmtree(output_root, ignore_errors=True)
     output_root.mkdir(parents=True, exist_ok=True)
 
-    for svg_path in sorted(source_root.glob("*.svg")):
-        frames: list[Tuple[int, Image.Image]] = []
-        for size in sizes:
-            high_res = render_svg(
+    svg_paths = sorted(source_root.glob("*.svg"))
+
+    # Each icon is independent (render -> downsample -> QOI encode -> write),
+    # and the QOI encoder is pure CPU-bound Python, so a process pool scales
+    # across cores where threads would serialize on the GIL. Workers create
+    # their own offscreen renderer state on first use.
+    with concurrent.futures.ProcessPoolExecutor() as pool:
+        futures = [
+            pool.submit(
+                rasterize_icon,
                 svg_path,
-                size=size,
-                supersample=args.supersample,
-                renderer=args.renderer,
-                sanitize=not args.no_sanitize_svg,
-            )
-            frame_alpha = "straight" if background is not None or args.alpha == "opaque" else args.alpha
-            image = downsample_rgba(
-                high_res,
-                target_size=size,
-                filt=filt,
-                color_space=args.color_space,
-                alpha_mode=frame_alpha,
+                output_root,
+                sizes,
+                args.supersample,
+                args.renderer,
+                not args.no_sanitize_svg,
+                args.filter,
+                args.color_space,
+                args.alpha,
+                background,
+                args.emit_png_preview,
             )
-            image = flatten_if_requested(image, background)
-            if args.alpha == "opaque":
-                image = image.convert("RGB").convert("RGBA")
-                # Force alpha fully opaque after flatten.
-                if np is not None:
-                    arr = np.asarray(image, dtype=np.uint8).copy()
-                    arr[:, :, 3] = 255
-                    image = Image.fromarray(arr, "RGBA")
-                else:
-                    r, g, b, _a = image.split()
-                    image = Image.merge("RGBA", (r, g, b, Image.new("L", image.size, 255)))
-
-            frames.append((size, image))
-
-            if args.emit_png_preview:
-                size_dir = output_root / str(size)
-                size_dir.mkdir(parents=True, exist_ok=True)
-
-            if args.emit_png_preview:
-                preview_path = size_dir / f"{svg_path.stem}.png"
-                # PNGs should be straight-alpha for accurate inspection in normal viewers.
-                if args.alpha == "premultiplied" and background is None:
-                    # Re-render as straight preview rather than trying to unpremultiply quantized frame pixels.
-                    preview_image = downsample_rgba(
-                        high_res,
-                        target_size=size,
-                        filt=filt,
-                        color_space=args.color_space,
-                        alpha_mode="straight",
-                    )
-                    preview_image.save(preview_path)
-                else:
-                    image.save(preview_path)
-
-        write_uoic(output_root / f"{svg_path.stem}.uoic", frames, args.alpha)
+            for svg_path in svg_paths
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
 
     return 0
 
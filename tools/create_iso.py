@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import argparse
+import shutil
 import struct
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import BinaryIO
 
 
 SECTOR_SIZE = 2048
@@ -181,25 +183,34 @@ def volume_terminator() -> bytes:
     return bytes(record)
 
 
+def stream_file_padded(out: BinaryIO, source: Path) -> None:
+    start = out.tell()
+    with source.open("rb") as src:
+        shutil.copyfileobj(src, out, length=1 << 20)
+    padding = (start - out.tell()) % SECTOR_SIZE
+    if padding:
+        out.write(b"\x00" * padding)
+
+
 def build_iso(efi_image: Path, bootloader: Path, kernel: Path, unifs: Path, output: Path) -> None:
     timestamp = datetime.now(timezone.utc)
-    visible_bootloader = bootloader.read_bytes()
-    kernel_bytes = kernel.read_bytes()
-    unifs_bytes = unifs.read_bytes()
-    boot_image = efi_image.read_bytes()
+    bootloader_size = bootloader.stat().st_size
+    kernel_size = kernel.stat().st_size
+    unifs_size = unifs.stat().st_size
+    boot_image_size = efi_image.stat().st_size
 
     bootloader_extent = FIRST_FILE_SECTOR
-    kernel_extent = bootloader_extent + ceil_div(len(visible_bootloader), SECTOR_SIZE)
-    unifs_extent = kernel_extent + ceil_div(len(kernel_bytes), SECTOR_SIZE)
-    boot_image_extent = unifs_extent + ceil_div(len(unifs_bytes), SECTOR_SIZE)
-    volume_space_size = boot_image_extent + ceil_div(len(boot_image), SECTOR_SIZE)
+    kernel_extent = bootloader_extent + ceil_div(bootloader_size, SECTOR_SIZE)
+    unifs_extent = kernel_extent + ceil_div(kernel_size, SECTOR_SIZE)
+    boot_image_extent = unifs_extent + ceil_div(unifs_size, SECTOR_SIZE)
+    volume_space_size = boot_image_extent + ceil_div(boot_image_size, SECTOR_SIZE)
 
     root_dir_record = directory_record(ROOT_DIR_SECTOR, SECTOR_SIZE, True, b"\x00", timestamp)
     efi_dir_record = directory_record(EFI_DIR_SECTOR, SECTOR_SIZE, True, b"EFI", timestamp)
     boot_dir_record = directory_record(BOOT_DIR_SECTOR, SECTOR_SIZE, True, b"BOOT", timestamp)
-    kernel_record = directory_record(kernel_extent, len(kernel_bytes), False, b"KERNEL.ELF;1", timestamp)
-    unifs_record = directory_record(unifs_extent, len(unifs_bytes), False, b"UNIFS.IMG;1", timestamp)
-    bootloader_record = directory_record(bootloader_extent, len(visible_bootloader), False, b"BOOTX64.EFI;1",
+    kernel_record = directory_record(kernel_extent, kernel_size, False, b"KERNEL.ELF;1", timestamp)
+    unifs_record = directory_record(unifs_extent, unifs_size, False, b"UNIFS.IMG;1", timestamp)
+    bootloader_record = directory_record(bootloader_extent, bootloader_size, False, b"BOOTX64.EFI;1",
                                          timestamp)
 
     root_directory = pad_to_sector(
@@ -238,28 +249,33 @@ def build_iso(efi_image: Path, bootloader: Path, kernel: Path, unifs: Path, outp
             path_table_record(b"BOOT", BOOT_DIR_SECTOR, 2, False),
         )))
 
-    image = b"".join((
+    metadata = b"".join((
         b"\x00" * (SYSTEM_AREA_SECTORS * SECTOR_SIZE),
         pvd_record(volume_space_size, 34, root_dir_record, timestamp),
         boot_record(BOOT_CATALOG_SECTOR),
         volume_terminator(),
         little_path_table,
         big_path_table,
-        build_boot_catalog(boot_image_extent, len(boot_image), timestamp),
+        build_boot_catalog(boot_image_extent, boot_image_size, timestamp),
         root_directory,
         efi_directory,
         boot_directory,
-        pad_to_sector(visible_bootloader),
-        pad_to_sector(kernel_bytes),
-        pad_to_sector(unifs_bytes),
-        pad_to_sector(boot_image),
     ))
 
-    if len(image) != volume_space_size * SECTOR_SIZE:
-        raise ValueError("internal ISO layout error: computed size does not match generated image")
-
     output.parent.mkdir(parents=True, exist_ok=True)
-    output.write_bytes(image)
+    # Only the small metadata sectors are materialized in memory; the kernel,
+    # unifs, and EFI payloads are streamed through a 1 MiB buffer so peak
+    # memory no longer scales with the ISO size.
+    with output.open("wb") as out:
+        out.write(metadata)
+        stream_file_padded(out, bootloader)
+        stream_file_padded(out, kernel)
+        stream_file_padded(out, unifs)
+        stream_file_padded(out, efi_image)
+
+        if out.tell() != volume_space_size * SECTOR_SIZE:
+            raise ValueError("internal ISO layout error: computed size does not match generated image")
+
     print(f"[Tool] UEFI ISO created at {output}")
 
 
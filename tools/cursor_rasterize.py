@@ -120,16 +120,17 @@ def render_svg(svg_path: Path, size: int) -> Image.Image:
     return Image.open(io.BytesIO(png_bytes)).convert("RGBA")
 
 
-def resolve_svg_path(cursor_dir: Path, filename: str) -> Path:
-    direct = cursor_dir / filename
-    if direct.is_file():
-        return direct
+def resolve_svg_path(cursor_dir: Path, filename: str, entry_names: set) -> Path:
+    # entry_names is a one-shot scandir snapshot of cursor_dir, so resolving
+    # each source is a set lookup instead of one or two stat round-trips.
+    if filename in entry_names:
+        return cursor_dir / filename
 
-    alternate = cursor_dir / filename.replace("-", "_")
-    if alternate.is_file():
-        return alternate
+    alternate = filename.replace("-", "_")
+    if alternate in entry_names:
+        return cursor_dir / alternate
 
-    raise FileNotFoundError(f"Missing cursor SVG: {direct}")
+    raise FileNotFoundError(f"Missing cursor SVG: {cursor_dir / filename}")
 
 
 def premultiply_rgba(image: Image.Image) -> Image.Image:
@@ -290,13 +291,21 @@ def main() -> int:
 
         role = ROLE_BY_CURSOR_DIR.get(cursor_dir.name, UOCU_ROLE_ARROW)
         source_entries = load_metadata(metadata_path)
+
+        # One directory read per cursor; paths are then resolved once rather
+        # than re-stated for every requested size.
+        with os.scandir(cursor_dir) as it:
+            entry_names = {entry.name for entry in it}
+        resolved_sources = []
+        for source_entry in source_entries:
+            filename = source_entry.get("filename")
+            if not filename:
+                continue
+            resolved_sources.append((resolve_svg_path(cursor_dir, filename, entry_names), source_entry))
+
         rendered_entries: list[dict] = []
         for size in sizes:
-            for source_entry in source_entries:
-                filename = source_entry.get("filename")
-                if not filename:
-                    continue
-                svg_path = resolve_svg_path(cursor_dir, filename)
+            for svg_path, source_entry in resolved_sources:
                 nominal_size = int(source_entry.get("nominal_size", 24))
                 image = premultiply_rgba(render_svg(svg_path, size))
                 rendered_entries.append(
@@ -4,70 +4,135 @@ import os
 import struct
 import sys
 
-def create_unifs(source_dir, output_file):
-    entries_to_add = [] # (name, is_dir, source_path)
+# Header: Magic (8 bytes), File Count (8 bytes)
+HEADER = struct.Struct("<8sQ")
+# Entry: Name (64s), Offset (Q), Size (Q)
+ENTRY = struct.Struct("<64sQQ")
+
+def create_unifs(source_dir, output_file, quiet=False):
+    entries_to_add = [] # (name_bytes, is_dir, source_path, size, mtime_ns)
+    truncated = []
+
+    def encode_name(name):
+        name_bytes = name.encode('utf-8')
+        if len(name_bytes) > 63:
+            truncated.append(name)
+        return name_bytes[:63]
+
+    # rel_prefix is built up incrementally ("" at the root, "sub/dir/" below),
+    # so each entry name is one concatenation instead of an os.path.relpath
+    # walk over both paths. Entry names never contain backslashes this way.
+    def walk(dir_path, rel_prefix):
+        subdirs = []
+        files = []
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry)
+                elif entry.is_file(follow_symlinks=False):
+                    files.append(entry)
 
-    for root, dirs, filenames in os.walk(source_dir):
         # Add directories
-        for d in dirs:
-            dirpath = os.path.join(root, d)
-            rel_path = os.path.relpath(dirpath, source_dir).replace("\\", "/")
-            entries_to_add.append((rel_path + "/", True, None))
+        for entry in subdirs:
+            entries_to_add.append((encode_name(rel_prefix + entry.name + "/"), True, None, 0, 0))
 
         # Add files
-        for filename in filenames:
-            filepath = os.path.join(root, filename)
-            rel_path = os.path.relpath(filepath, source_dir).replace("\\", "/")
-            entries_to_add.append((rel_path, False, filepath))
+        for entry in files:
+            st = entry.stat(follow_symlinks=False)
+            entries_to_add.append((encode_name(rel_prefix + entry.name), False, entry.path,
+                                   st.st_size, st.st_mtime_ns))
+
+        for entry in subdirs:
+            walk(entry.path, rel_prefix + entry.name + "/")
+
+    walk(source_dir, "")
+
+    # Incremental-build cache: if the (name, size, mtime) set matches the
+    # previous run, the archive contents would come out identical, so only
+    # the output mtime is refreshed and the O(total-bytes) copy is skipped.
+    manifest = b"".join(
+        name_bytes + b"\t%d\t%d\n" % (size, mtime_ns)
+        for name_bytes, is_dir, filepath, size, mtime_ns in entries_to_add
+    )
+    manifest_file = output_file + ".manifest"
+    if os.path.exists(output_file):
+        try:
+            with open(manifest_file, "rb") as f:
+                if f.read() == manifest:
+                    os.utime(output_file)
+                    if not quiet:
+                        print(f"{output_file} is up to date with {len(entries_to_add)} files.")
+                    return
+        except OSError:
+            pass
 
-    # Header: Magic (8 bytes), File Count (8 bytes)
     magic = b"UNIFS v1"
     file_count = len(entries_to_add)
 
-    header = struct.pack("<8sQ", magic, file_count)
-
-    # Header size: 16 bytes
-    # Entry size: 80 bytes
-    current_offset = 16 + (file_count * 80)
+    # One contiguous header + entry table buffer, issued as a single write
+    # instead of one write per 80-byte entry.
+    table = bytearray(HEADER.size + file_count * ENTRY.size)
+    HEADER.pack_into(table, 0, magic, file_count)
 
-    entries = []
-    data_blob = bytearray()
+    current_offset = len(table)
 
-    for name, is_dir, filepath in entries_to_add:
-        content = b""
-        if not is_dir and filepath:
-            with open(filepath, "rb") as f:
-                content = f.read()
-
-        size = len(content)
-
-        # Entry: Name (64s), Offset (Q), Size (Q)
-        name_bytes = name.encode('utf-8')
-        if len(name_bytes) > 63:
-            print(f"Warning: Name {name} truncated")
-            name_bytes = name_bytes[:63]
-
-        entry = struct.pack("<64sQQ", name_bytes, current_offset, size)
-        entries.append(entry)
+    # Sizes come from the scandir stat results, so the table is final before
+    # any data is written and the output stays strictly append-only.
+    for i, (name_bytes, is_dir, filepath, size, _mtime_ns) in enumerate(entries_to_add):
+        ENTRY.pack_into(table, HEADER.size + i * ENTRY.size, name_bytes, current_offset, size)
 
         if not is_dir:
-            data_blob.extend(content)
             current_offset += size
         else:
             # Directory uses 0 offset or just points to nothing
             pass
 
-    with open(output_file, "wb") as f:
-        f.write(header)
-        for entry in entries:
-            f.write(entry)
-        f.write(data_blob)
-
-    print(f"Created {output_file} with {file_count} files.")
+    # Reusable copy buffer so peak memory stays O(buffer), not O(largest file).
+    buf = bytearray(1 << 20)
+    view = memoryview(buf)
+
+    # Not available on Windows.
+    fadvise = getattr(os, "posix_fadvise", None)
+
+    with open(output_file, "wb") as out:
+        if fadvise is not None:
+            fadvise(out.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        out.write(table)
+
+        for name_bytes, is_dir, filepath, size, _mtime_ns in entries_to_add:
+            if is_dir or not filepath:
+                continue
+            with open(filepath, "rb") as src:
+                if fadvise is not None:
+                    # Each source is read once, front to back: ask for a large
+                    # readahead window up front...
+                    fadvise(src.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                while True:
+                    n = src.readinto(view)
+                    if not n:
+                        break
+                    out.write(view[:n])
+                if fadvise is not None:
+                    # ...and drop its pages afterwards so a multi-GB image
+                    # build does not evict hot build artifacts.
+                    fadvise(src.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+    with open(manifest_file, "wb") as f:
+        f.write(manifest)
+
+    # Batch the per-name warnings into a single write instead of one
+    # line-buffered print per truncated entry.
+    if truncated:
+        sys.stderr.write("".join(f"Warning: Name {name} truncated\n" for name in truncated))
+
+    if not quiet:
+        print(f"Created {output_file} with {file_count} files.")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: mkunifs.py <source_dir> <output_file>")
+    args = [arg for arg in sys.argv[1:] if arg != "--quiet"]
+    if len(args) < 2:
+        print("Usage: mkunifs.py [--quiet] <source_dir> <output_file>")
         sys.exit(1)
 
-    create_unifs(sys.argv[1], sys.argv[2])
+    create_unifs(args[0], args[1], quiet=len(args) != len(sys.argv) - 1)
@@ -38,6 +38,11 @@ def main() -> int:
     output = bytearray()
     lock = threading.Lock()
 
+    # Markers are matched against the raw byte stream; encoding them once
+    # avoids re-decoding the whole accumulated output on every poll.
+    success_markers = [(pattern, pattern.encode("utf-8")) for pattern in args.success]
+    fail_markers = [(pattern, pattern.encode("utf-8")) for pattern in args.fail]
+
     proc = subprocess.Popen(
         args.command,
         stdin=subprocess.DEVNULL,
@@ -65,13 +70,13 @@ def main() -> int:
 
     while time.monotonic() < deadline:
         with lock:
-            text = output.decode("utf-8", errors="replace")
+            snapshot = bytes(output)
 
-        failure_seen = next((pattern for pattern in args.fail if pattern in text), None)
+        failure_seen = next((pattern for pattern, raw in fail_markers if raw in snapshot), None)
         if failure_seen:
             break
 
-        if all(pattern in text for pattern in args.success):
+        if all(raw in snapshot for _pattern, raw in success_markers):
             success_seen = True
             break
 
@@ -84,14 +89,14 @@ def main() -> int:
     thread.join(timeout=2.0)
 
     with lock:
-        text = output.decode("utf-8", errors="replace")
+        snapshot = bytes(output)
 
-    failure_seen = failure_seen or next((pattern for pattern in args.fail if pattern in text), None)
+    failure_seen = failure_seen or next((pattern for pattern, raw in fail_markers if raw in snapshot), None)
     if failure_seen:
         print(f"\nqemu-smoke: failed after seeing marker: {failure_seen}", file=sys.stderr)
         return 1
 
-    missing = [pattern for pattern in args.success if pattern not in text]
+    missing = [pattern for pattern, raw in success_markers if raw not in snapshot]
     if missing:
         print(f"\nqemu-smoke: missing success marker(s): {', '.join(missing)}", file=sys.stderr)
         return 1
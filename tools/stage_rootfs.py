@@ -2,10 +2,28 @@
 from __future__ import annotations
 
 import argparse
+import os
 import shutil
 from pathlib import Path
 
 
+def copy_if_stale(src: str, dst: str) -> None:
+    """Copy src over dst unless dst already matches it by size and mtime.
+
+    Re-staging runs after every build; most of the rootfs is unchanged, so
+    two stat calls usually replace a full data copy.
+    """
+    try:
+        src_stat = os.stat(src)
+        dst_stat = os.stat(dst)
+    except OSError:
+        pass
+    else:
+        if dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime_ns >= src_stat.st_mtime_ns:
+            return
+    shutil.copyfile(src, dst)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Stage the runtime rootfs for Meson builds.")
     parser.add_argument("--source-rootfs", required=True)
@@ -34,19 +52,23 @@ def main() -> int:
     stamp = Path(args.stamp).resolve()
 
     build_rootfs.mkdir(parents=True, exist_ok=True)
-    shutil.copytree(source_rootfs, build_rootfs, dirs_exist_ok=True)
+    # copy_if_stale falls through to copyfile, which takes the platform
+    # fast-copy path (sendfile/fcopyfile/CopyFileW) and skips the metadata
+    # work of copy2; the staged tree only feeds image builders that read file
+    # contents, so timestamps and modes are not needed.
+    shutil.copytree(source_rootfs, build_rootfs, dirs_exist_ok=True, copy_function=copy_if_stale)
 
     for rel_dest, source in args.overlay:
         src = Path(source).resolve()
         dest = build_rootfs / Path(rel_dest)
         dest.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src, dest)
+        copy_if_stale(src, dest)
 
     for rel_dest, source_dir in args.overlay_tree:
         src = Path(source_dir).resolve()
         dest = build_rootfs / Path(rel_dest)
         dest.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copytree(src, dest, dirs_exist_ok=True)
+        shutil.copytree(src, dest, dirs_exist_ok=True, copy_function=copy_if_stale)
 
     stamp.parent.mkdir(parents=True, exist_ok=True)
     stamp.write_text("ok\n", encoding="utf-8")